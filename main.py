@@ -5,61 +5,108 @@ Built specifically for Railway deployment with ElevenLabs integration
 """
 
 import os
-import json
+import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+import random
+from datetime import datetime, timedelta, timezone
+from urllib.parse import quote
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Union
+from contextlib import asynccontextmanager, suppress
+from contextvars import ContextVar
 from dataclasses import dataclass
-import io
-import base64
 
-from fastapi import FastAPI, HTTPException, Response
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, JSONResponse
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, create_model
 import uvicorn
-import requests
+import httpx
+import orjson
+import ciso8601
+from cachetools import TTLCache
+from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+from slowapi.util import get_remote_address
 
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+# google-auth is imported lazily where it's used, to keep module import and
+# cold start cheap
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the Google Calendar service once at startup and share it across requests"""
+    app.state.http_client = build_http_client()
+    app.state.calendar_service = build_calendar_service(build_credentials(), app.state.http_client)
+    
+    # Keep the access token fresh in the background; the client still refreshes
+    # inline on a 401 as a fallback
+    refresh_task = asyncio.create_task(refresh_loop(app))
+    yield
+    refresh_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await refresh_task
+    await app.state.http_client.aclose()
+
 # FastAPI app
-app = FastAPI(title="Google Calendar MCP Server", version="1.0.0")
+app = FastAPI(
+    title="Google Calendar MCP Server",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
+
+# Per-client rate limit shared by every endpoint that can reach Google Calendar,
+# so bursts are rejected before they cost an upstream call. Set
+# RATE_LIMIT_STORAGE_URI=redis://... to share counters between instances.
+RATE_LIMIT = os.environ.get("RATE_LIMIT", "20/second")
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=os.environ.get("RATE_LIMIT_STORAGE_URI", "memory://")
+)
+app.state.limiter = limiter
+app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+rate_limit = limiter.shared_limit(RATE_LIMIT, scope="mcp")
 
-# CORS middleware - Comprehensive for ElevenLabs MCP integration
+# CORS middleware - ElevenLabs origins only. An exact allowlist is what
+# browsers require with allow_credentials (they reject "*"), and max_age lets
+# them cache a preflight for a day instead of repeating it per request.
+# CORS_ORIGINS (comma-separated) replaces the exact list, e.g. for a local UI.
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get("CORS_ORIGINS", "https://api.elevenlabs.io,https://elevenlabs.io").split(",")
+    if origin.strip()
+]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for maximum compatibility
+    allow_origins=CORS_ORIGINS,
+    allow_origin_regex=r"https://([a-z0-9-]+\.)*elevenlabs\.io",
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "HEAD"],
-    allow_headers=[
-        "*",
-        "Content-Type",
-        "Authorization", 
-        "X-Requested-With",
-        "Accept",
-        "Origin",
-        "User-Agent",
-        "DNT",
-        "Cache-Control",
-        "X-Mx-ReqToken",
-        "Keep-Alive",
-        "X-CSRFToken"
-    ],
-    expose_headers=["*"]
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["content-type", "authorization", "cache-control"],
+    max_age=86400
 )
 
 # MCP Request/Response Models
 class MCPRequest(BaseModel):
+    # Unknown keys are kept so the raw request can still be logged in full
+    model_config = ConfigDict(extra="allow")
+
     jsonrpc: str = "2.0"
-    id: int
-    method: str
-    params: Optional[Dict[str, Any]] = None
+    id: Optional[Union[int, float, str]] = 1
+    method: str = ""
+    # JSON-RPC also allows positional (list) params; no method here reads them
+    params: Optional[Union[Dict[str, Any], List[Any]]] = None
+    # ElevenLabs sends OpenAI-style tool calls instead of a JSON-RPC method
+    tool_calls: Optional[List[Dict[str, Any]]] = None
+
+    def is_empty(self) -> bool:
+        """True for a bare `{}` body, which ElevenLabs sends to discover tools"""
+        return not self.model_fields_set
 
 class MCPResponse(BaseModel):
     jsonrpc: str = "2.0"
@@ -71,6 +118,9 @@ class MCPError(BaseModel):
     code: int
     message: str
 
+# Upper bound on get_appointments' limit argument
+MAX_APPOINTMENTS = 500
+
 # Tool definitions - compatible with both MCP and ElevenLabs
 MCP_TOOLS = [
     {
@@ -80,7 +130,7 @@ MCP_TOOLS = [
             "type": "object",
             "properties": {
                 "date": {"type": "string", "description": "Date to check (YYYY-MM-DD)"},
-                "duration": {"type": "integer", "description": "Appointment duration in minutes", "default": 60}
+                "duration": {"type": "integer", "description": "Appointment duration in minutes", "default": 60, "minimum": 15, "maximum": 480}
             },
             "required": ["date"]
         },
@@ -93,7 +143,7 @@ MCP_TOOLS = [
             "properties": {
                 "date": {"type": "string", "description": "Appointment date (YYYY-MM-DD)"},
                 "time": {"type": "string", "description": "Appointment time (HH:MM)"},
-                "duration": {"type": "integer", "description": "Duration in minutes", "default": 60},
+                "duration": {"type": "integer", "description": "Duration in minutes", "default": 60, "minimum": 15, "maximum": 480},
                 "patient_name": {"type": "string", "description": "Patient's name"},
                 "patient_email": {"type": "string", "description": "Patient's email"},
                 "phone": {"type": "string", "description": "Patient's phone number"},
@@ -123,7 +173,7 @@ MCP_TOOLS = [
                 "appointment_id": {"type": "string", "description": "Google Calendar event ID"},
                 "new_date": {"type": "string", "description": "New date (YYYY-MM-DD)"},
                 "new_time": {"type": "string", "description": "New time (HH:MM)"},
-                "duration": {"type": "integer", "description": "Duration in minutes", "default": 60}
+                "duration": {"type": "integer", "description": "Duration in minutes", "default": 60, "minimum": 15, "maximum": 480}
             },
             "required": ["appointment_id", "new_date", "new_time"]
         }
@@ -135,7 +185,9 @@ MCP_TOOLS = [
             "type": "object",
             "properties": {
                 "start_date": {"type": "string", "description": "Start date (YYYY-MM-DD)"},
-                "end_date": {"type": "string", "description": "End date (YYYY-MM-DD)"}
+                "end_date": {"type": "string", "description": "End date (YYYY-MM-DD)"},
+                "limit": {"type": "integer", "description": "Maximum number of appointments to return (up to 500)", "default": 100, "minimum": 1, "maximum": MAX_APPOINTMENTS},
+                "page_token": {"type": "string", "description": "Token from a previous truncated result, to fetch the next appointments"}
             },
             "required": ["start_date", "end_date"]
         }
@@ -146,472 +198,604 @@ MCP_TOOLS = [
         "inputSchema": {
             "type": "object",
             "properties": {
-                "duration": {"type": "integer", "description": "Appointment duration in minutes", "default": 60},
-                "days_ahead": {"type": "integer", "description": "How many days to search ahead", "default": 30}
+                "duration": {"type": "integer", "description": "Appointment duration in minutes", "default": 60, "minimum": 15, "maximum": 480},
+                "days_ahead": {"type": "integer", "description": "How many days to search ahead", "default": 30, "minimum": 1, "maximum": 365}
             }
         }
     },
 ]
 
-def get_calendar_service():
-    """Create Google Calendar service with OAuth credentials"""
+MCP_PROTOCOL_VERSION = "2024-11-05"
+SERVER_NAME = "Google Calendar MCP Server"
+SERVER_VERSION = "1.0.0"
+
+# Response payloads derived from MCP_TOOLS, built once at import time.
+# Handlers return them as-is, so they must never be mutated.
+INIT_RESULT = {
+    "protocolVersion": MCP_PROTOCOL_VERSION,
+    "capabilities": {
+        "tools": {}
+    },
+    "serverInfo": {
+        "name": SERVER_NAME,
+        "version": SERVER_VERSION
+    }
+}
+TOOLS_RESULT = {"tools": MCP_TOOLS}
+# Server info and tools in one result, for clients that skip tools/list
+COMBINED_RESULT = {**INIT_RESULT, "tools": MCP_TOOLS}
+
+SERVER_INFO_RESPONSE = {"jsonrpc": "2.0", "result": INIT_RESULT}
+TOOLS_LIST_RESPONSE = {"jsonrpc": "2.0", "id": 1, "result": TOOLS_RESULT}
+
+# MCP tools converted to OpenAI function format for ElevenLabs
+OPENAI_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": tool["name"],
+            "description": tool["description"],
+            "parameters": tool["inputSchema"]
+        }
+    }
+    for tool in MCP_TOOLS
+]
+
+# Python types for the JSON Schema types used in MCP_TOOLS input schemas
+JSON_SCHEMA_TYPES = {"string": str, "integer": int, "number": float, "boolean": bool}
+
+def build_params_model(tool):
+    """Generate a Pydantic model for a tool's arguments from its inputSchema.
+
+    minimum/maximum in a property become ge/le bounds on its field. Numbers
+    sent for string fields (phone numbers, numeric-looking IDs) are accepted
+    as strings, since LLM-generated arguments often send them unquoted.
+    """
+    schema = tool["inputSchema"]
+    required = set(schema.get("required", []))
+    fields = {}
+    for name, prop in schema["properties"].items():
+        field_type = JSON_SCHEMA_TYPES[prop["type"]]
+        bounds = {"ge": prop.get("minimum"), "le": prop.get("maximum")}
+        if name in required:
+            fields[name] = (field_type, Field(..., **bounds))
+        elif "default" in prop:
+            fields[name] = (field_type, Field(prop["default"], **bounds))
+        else:
+            fields[name] = (Optional[field_type], Field(None, **bounds))
+    model_name = "".join(part.title() for part in tool["name"].split("_")) + "Params"
+    return create_model(model_name, __config__=ConfigDict(coerce_numbers_to_str=True), **fields)
+
+# Tool name -> arguments model, so calls are validated once at dispatch and
+# bad input is rejected before any Calendar request is made
+PARAM_MODELS = {tool["name"]: build_params_model(tool) for tool in MCP_TOOLS}
+
+def parse_tool_arguments(tool_name: str, arguments: Union[Dict[str, Any], str, None]) -> BaseModel:
+    """Validate tool arguments (a dict, or a JSON string as OpenAI-style tool calls send them)"""
+    model = PARAM_MODELS[tool_name]
     try:
-        # Get credentials from environment
-        access_token = os.environ.get('GOOGLE_ACCESS_TOKEN')
-        refresh_token = os.environ.get('GOOGLE_REFRESH_TOKEN')
-        client_id = os.environ.get('GOOGLE_CLIENT_ID')
-        client_secret = os.environ.get('GOOGLE_CLIENT_SECRET')
-        
-        if not all([access_token, refresh_token, client_id, client_secret]):
-            logger.error("Missing OAuth credentials in environment variables")
-            return None
-            
-        # Create credentials
-        creds = Credentials(
-            token=access_token,
-            refresh_token=refresh_token,
-            client_id=client_id,
-            client_secret=client_secret,
-            token_uri='https://oauth2.googleapis.com/token'
+        if isinstance(arguments, (str, bytes)):
+            return model.model_validate_json(arguments)
+        return model.model_validate(arguments or {})
+    except ValidationError as e:
+        problems = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'arguments'}: {error['msg']}"
+            for error in e.errors()
+        )
+        raise HTTPException(status_code=400, detail=f"Invalid arguments for {tool_name}: {problems}")
+
+# Static GET payloads serialized once; their endpoints write these bytes as-is
+SERVER_INFO_BYTES = orjson.dumps(SERVER_INFO_RESPONSE)
+TOOLS_LIST_BYTES = orjson.dumps(TOOLS_LIST_RESPONSE)
+TOOLS_RESULT_BYTES = orjson.dumps(TOOLS_RESULT)
+OPENAI_TOOLS_BYTES = orjson.dumps(OPENAI_TOOLS)
+MCP_INFO_BYTES = orjson.dumps({"jsonrpc": "2.0", "id": 1, "result": INIT_RESULT})
+WEBHOOK_INFO_BYTES = orjson.dumps({
+    "status": "ready",
+    "webhook_url": "/elevenlabs/webhook",
+    "method": "POST",
+    "description": "ElevenLabs webhook endpoint for agent tool calls"
+})
+
+MCP_RESPONSE_HEADERS = {
+    "Content-Type": "application/json",
+    "X-MCP-Version": MCP_PROTOCOL_VERSION,
+    "X-Server-Name": SERVER_NAME
+}
+
+CALENDAR_API_URL = "https://www.googleapis.com/calendar/v3"
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Google OAuth and calendar settings, read from the environment once at import"""
+    access_token: Optional[str]
+    refresh_token: Optional[str]
+    client_id: Optional[str]
+    client_secret: Optional[str]
+    calendar_id: str = "primary"
+
+    @classmethod
+    def from_env(cls) -> "Config":
+        return cls(
+            access_token=os.environ.get('GOOGLE_ACCESS_TOKEN'),
+            refresh_token=os.environ.get('GOOGLE_REFRESH_TOKEN'),
+            client_id=os.environ.get('GOOGLE_CLIENT_ID'),
+            client_secret=os.environ.get('GOOGLE_CLIENT_SECRET'),
+            calendar_id=os.environ.get('GOOGLE_CALENDAR_ID', 'primary')
         )
+
+    @property
+    def has_credentials(self) -> bool:
+        return all([self.access_token, self.refresh_token, self.client_id, self.client_secret])
+
+CONFIG = Config.from_env()
+
+# Maximum number of in-flight requests to the Calendar API per worker process,
+# kept low enough that a burst of tool calls stays inside Google's per-user quota
+GOOGLE_API_CONCURRENCY = int(os.environ.get("GOOGLE_API_CONCURRENCY", 10))
+# Rate-limited (and, for idempotent requests, 5xx) responses are retried this
+# many times with exponential backoff and full jitter, starting from BACKOFF seconds
+GOOGLE_API_RETRIES = 3
+GOOGLE_API_BACKOFF = 0.5
+RETRYABLE_STATUS_CODES = {500, 502, 503, 504}
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+# Partial-response masks for events.list: just what the handlers read. Whole
+# start/end objects are kept because all-day events carry 'date', not 'dateTime'.
+# transparency lets busy_intervals skip free events, as freeBusy does.
+BUSY_LIST_FIELDS = "items(start,end,transparency),nextPageToken"
+APPOINTMENT_LIST_FIELDS = "items(id,summary,start,end),nextPageToken"
+# get_appointments reads are cached this long, so a burst of listings over the
+# same range hits Google once. The cache is per worker process and a write only
+# clears the worker that made it, so availability checks never read from it:
+# a stale busy list there would offer a slot another worker just booked.
+CALENDAR_CACHE_TTL = 60
+CALENDAR_CACHE_SIZE = 512
+
+# Set per request by ?nocache=1 or Cache-Control: no-cache to skip cached reads
+bypass_cache: ContextVar[bool] = ContextVar("bypass_cache", default=False)
+
+async def read_cache_control(request: Request):
+    """Route dependency that lets a caller ask for fresh Calendar data"""
+    bypass_cache.set(
+        request.query_params.get("nocache") == "1"
+        or "no-cache" in request.headers.get("cache-control", "")
+    )
+
+class CalendarAPIError(Exception):
+    """Error response from the Google Calendar API"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Google Calendar API error {status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+
+class CalendarClient:
+    """Async Google Calendar REST client over a shared keep-alive connection pool"""
+
+    def __init__(self, creds: "Credentials", http_client: httpx.AsyncClient):
+        self.creds = creds
+        self.http_client = http_client
+        self.semaphore = asyncio.Semaphore(GOOGLE_API_CONCURRENCY)
+        # Only one token refresh at a time; concurrent 401s wait for it instead
+        # of each tying up a worker thread with its own refresh
+        self.refresh_lock = asyncio.Lock()
+        self.cache = TTLCache(maxsize=CALENDAR_CACHE_SIZE, ttl=CALENDAR_CACHE_TTL)
+        # Bumped on every write so a read that raced with it isn't cached
+        self.cache_generation = 0
+
+    async def refresh_credentials(self, stale_token: Optional[str] = None):
+        """Refresh the OAuth access token over the shared async HTTP client.
+
+        If stale_token is given and another caller already replaced it while we
+        waited for the lock, the refresh is skipped.
+        """
+        async with self.refresh_lock:
+            if stale_token is not None and self.creds.token != stale_token:
+                return
+            # Same refresh_token grant creds.refresh() performs, without its
+            # blocking requests transport or a worker thread
+            response = await self.http_client.post(self.creds.token_uri, data={
+                "grant_type": "refresh_token",
+                "refresh_token": self.creds.refresh_token,
+                "client_id": self.creds.client_id,
+                "client_secret": self.creds.client_secret
+            })
+            if response.is_error:
+                from google.auth.exceptions import RefreshError
+                raise RefreshError(f"Token refresh failed ({response.status_code}): {response.text}")
+            data = response.json()
+            self.creds.token = data["access_token"]
+            # google-auth compares expiry against naive UTC
+            self.creds.expiry = datetime.utcnow() + timedelta(seconds=data.get("expires_in", 3600))
+
+    async def _send(self, method: str, path: str, token: str, **kwargs) -> httpx.Response:
+        headers = {"Authorization": f"Bearer {token}"}
+        async with self.semaphore:
+            return await self.http_client.request(method, CALENDAR_API_URL + path, headers=headers, **kwargs)
+
+    @staticmethod
+    def _is_rate_limited(response: httpx.Response) -> bool:
+        if response.status_code == 429:
+            return True
+        if response.status_code != 403:
+            return False
+        # Calendar reports quota exhaustion as 403 with a rate-limit reason
+        try:
+            reasons = {error.get("reason") for error in response.json()["error"]["errors"]}
+        except Exception:
+            return False
+        return not reasons.isdisjoint(RATE_LIMIT_REASONS)
+
+    async def _send_authorized(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send with the current token, refreshing it and resending once on 401"""
+        token = self.creds.token
+        response = await self._send(method, path, token, **kwargs)
+        if response.status_code == 401:
+            logger.info("Google Calendar API returned 401, refreshing token inline")
+            await self.refresh_credentials(stale_token=token)
+            response = await self._send(method, path, self.creds.token, **kwargs)
+        return response
+
+    async def request(self, method: str, path: str, idempotent: Optional[bool] = None, **kwargs) -> Dict[str, Any]:
+        """Send an authorized request, refreshing the token and retrying once on 401.
+
+        Rate-limited responses are retried with backoff. Server errors are only
+        retried when the request is idempotent (by default: anything but POST),
+        so a booking is never created twice. Every attempt gets the 401 refresh,
+        since the token can expire during a backoff sleep.
+        """
+        if idempotent is None:
+            idempotent = method != "POST"
+        response = await self._send_authorized(method, path, **kwargs)
+        server_error_retried = False
         
-        # Build service
-        service = build('calendar', 'v3', credentials=creds)
-        logger.info("Google Calendar service created successfully")
-        return service
+        for attempt in range(GOOGLE_API_RETRIES):
+            if not (self._is_rate_limited(response)
+                    or (idempotent and response.status_code in RETRYABLE_STATUS_CODES)):
+                break
+            server_error_retried = server_error_retried or response.status_code in RETRYABLE_STATUS_CODES
+            delay = random.uniform(0, GOOGLE_API_BACKOFF * 2 ** attempt)
+            logger.warning("Google Calendar API returned %d, retrying in %.2fs", response.status_code, delay)
+            # Sleep without holding a semaphore slot so other calls can proceed
+            await asyncio.sleep(delay)
+            response = await self._send_authorized(method, path, **kwargs)
         
-    except Exception as e:
-        logger.error(f"Failed to create calendar service: {e}")
+        # A DELETE that failed with a server error may still have gone through,
+        # in which case the retry finds the event already gone
+        if method == "DELETE" and server_error_retried and response.status_code in (404, 410):
+            return {}
+        
+        if response.is_error:
+            try:
+                message = response.json()["error"]["message"]
+            except Exception:
+                message = response.text
+            raise CalendarAPIError(response.status_code, message)
+        
+        if not response.content:
+            return {}
+        return response.json()
+
+    async def cached_request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        """request() for reads, served from the TTL cache unless bypass_cache is set.
+
+        Cached responses are shared between callers and must not be mutated.
+        """
+        key = (method, path, orjson.dumps(kwargs, option=orjson.OPT_SORT_KEYS))
+        if not bypass_cache.get():
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        generation = self.cache_generation
+        # Only reads are cached, so they're always safe to retry
+        result = await self.request(method, path, idempotent=True, **kwargs)
+        if generation == self.cache_generation:
+            self.cache[key] = result
+        return result
+
+    def invalidate_cache(self):
+        """Drop all cached reads after a write to the calendar"""
+        self.cache_generation += 1
+        self.cache.clear()
+
+    @staticmethod
+    def _events_path(calendar_id: str, event_id: Optional[str] = None) -> str:
+        path = f"/calendars/{quote(calendar_id, safe='')}/events"
+        if event_id is not None:
+            path += f"/{quote(event_id, safe='')}"
+        return path
+
+    async def list_events(self, calendar_id: str, cached: bool = False, **params) -> Dict[str, Any]:
+        if cached:
+            return await self.cached_request("GET", self._events_path(calendar_id), params=params)
+        return await self.request("GET", self._events_path(calendar_id), params=params)
+
+    # `fields` is Google's partial-response mask: only the named parts of the
+    # event come back, instead of the full resource
+
+    async def insert_event(self, calendar_id: str, body: Dict[str, Any], fields: Optional[str] = None) -> Dict[str, Any]:
+        params = {"fields": fields} if fields else None
+        try:
+            return await self.request("POST", self._events_path(calendar_id), json=body, params=params)
+        finally:
+            self.invalidate_cache()
+
+    async def patch_event(self, calendar_id: str, event_id: str, body: Dict[str, Any], fields: Optional[str] = None) -> Dict[str, Any]:
+        params = {"fields": fields} if fields else None
+        try:
+            return await self.request("PATCH", self._events_path(calendar_id, event_id), json=body, params=params)
+        finally:
+            self.invalidate_cache()
+
+    async def delete_event(self, calendar_id: str, event_id: str) -> Dict[str, Any]:
+        try:
+            return await self.request("DELETE", self._events_path(calendar_id, event_id))
+        finally:
+            self.invalidate_cache()
+
+    async def query_freebusy(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        # freeBusy is a read despite being a POST, so it's safe to retry
+        return await self.request("POST", "/freeBusy", idempotent=True, json=body)
+
+# Refresh the access token this long before Google expires it
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+# Upper bound on how long the background refresher sleeps between checks
+TOKEN_REFRESH_INTERVAL = 60
+
+def build_credentials():
+    """Create OAuth credentials from the environment config"""
+    from google.oauth2.credentials import Credentials
+    
+    if not CONFIG.has_credentials:
+        logger.error("Missing OAuth credentials in environment variables")
         return None
+    
+    return Credentials(
+        token=CONFIG.access_token,
+        refresh_token=CONFIG.refresh_token,
+        client_id=CONFIG.client_id,
+        client_secret=CONFIG.client_secret,
+        token_uri='https://oauth2.googleapis.com/token'
+    )
 
-def get_calendar_id():
-    """Get the calendar ID from environment"""
-    return os.environ.get('GOOGLE_CALENDAR_ID', 'primary')
+def build_http_client():
+    """Create the pooled HTTP/2 client shared by all outbound calls (Calendar API and token refresh)"""
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=100),
+        timeout=30
+    )
+
+def build_calendar_service(creds, http_client):
+    """Create Google Calendar service with OAuth credentials"""
+    if creds is None:
+        return None
+    
+    service = CalendarClient(creds, http_client)
+    logger.info("Google Calendar service created successfully")
+    return service
 
+def get_calendar_service():
+    """Return the shared Google Calendar service, building it once on first use"""
+    # A None service (missing credentials) is cached as well: the environment
+    # can't change at runtime, so there's no point re-reading it per request
+    if not hasattr(app.state, "calendar_service"):
+        if getattr(app.state, "http_client", None) is None:
+            app.state.http_client = build_http_client()
+        app.state.calendar_service = build_calendar_service(build_credentials(), app.state.http_client)
+    return app.state.calendar_service
+
+def credentials_need_refresh(creds):
+    """Check whether the access token is expired, of unknown age, or about to expire"""
+    if creds.expiry is None:
+        # Token came from the environment, so we don't know when it expires
+        return True
+    return creds.expired or (creds.expiry - datetime.utcnow()) < TOKEN_REFRESH_MARGIN
+
+def seconds_until_refresh(creds):
+    """How long the background refresher can sleep before checking the token again"""
+    if creds is None or creds.expiry is None:
+        return TOKEN_REFRESH_INTERVAL
+    remaining = (creds.expiry - datetime.utcnow() - TOKEN_REFRESH_MARGIN).total_seconds()
+    return min(max(remaining, 0), TOKEN_REFRESH_INTERVAL)
+
+async def refresh_loop(app: FastAPI):
+    """Refresh the OAuth access token in the background so requests never wait on it"""
+    while True:
+        service = getattr(app.state, "calendar_service", None)
+        creds = service.creds if service is not None else None
+        if creds is not None and credentials_need_refresh(creds):
+            try:
+                await service.refresh_credentials()
+                logger.info("Refreshed Google OAuth token, expires at %s", creds.expiry)
+            except Exception as e:
+                logger.error("Background token refresh failed: %s", e)
+                await asyncio.sleep(TOKEN_REFRESH_INTERVAL)
+                continue
+        
+        await asyncio.sleep(seconds_until_refresh(creds))
+
+
+def as_json_response(content):
+    """Wrap a handler's dict result in an ORJSONResponse.
+
+    Returning a Response directly skips FastAPI's jsonable_encoder pass, which
+    otherwise walks every payload (including the full tool list) per request.
+    """
+    if isinstance(content, Response):
+        return content
+    return ORJSONResponse(content)
 
 @app.get("/")
 async def root():
     """Root endpoint - MCP server info for ElevenLabs compatibility"""
-    response_data = {
-        "jsonrpc": "2.0",
-        "result": {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {
-                "tools": {}
-            },
-            "serverInfo": {
-                "name": "Google Calendar MCP Server",
-                "version": "1.0.0"
-            }
-        }
-    }
-    
-    return JSONResponse(
-        content=response_data,
-        headers={
-            "Content-Type": "application/json",
-            "X-MCP-Version": "2024-11-05",
-            "X-Server-Name": "Google Calendar MCP Server",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-            "Access-Control-Allow-Headers": "*"
-        }
-    )
+    return Response(content=SERVER_INFO_BYTES, headers=MCP_RESPONSE_HEADERS)
 
-@app.post("/")
-async def root_post(request: dict):
+@app.post("/", dependencies=[Depends(read_cache_control)])
+@rate_limit
+async def root_post(request: Request, req: MCPRequest):
     """Root endpoint POST handler for MCP requests"""
-    logger.info(f"Received root POST request: {request}")
-    logger.info(f"Request keys: {list(request.keys()) if request else 'No request'}")
-    
-    # ElevenLabs might expect a direct tools list response
-    if not request or request == {}:
-        logger.info("Empty request at root - returning tools list")
-        return {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "result": {
-                "tools": MCP_TOOLS
-            }
-        }
-    
-    method = request.get("method", "")
-    logger.info(f"Root method: {method}")
-    
-    # Handle MCP initialization request
-    if method == "initialize":
-        logger.info("Returning initialization response")
-        return {
-            "jsonrpc": "2.0",
-            "id": request.get("id", 1),
-            "result": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {
-                    "tools": {}
-                },
-                "serverInfo": {
-                    "name": "Google Calendar MCP Server",
-                    "version": "1.0.0"
-                }
-            }
-        }
-    
-    # Handle tool list requests
-    elif method == "tools/list" or method == "list_tools":
-        logger.info("Returning tools list")
-        return {
-            "jsonrpc": "2.0",
-            "id": request.get("id", 1),
-            "result": {
-                "tools": MCP_TOOLS
-            }
-        }
-    
-    # Handle tool calls
-    elif method == "tools/call":
-        logger.info("Handling tool call")
-        return await call_tool(request)
-    
-    # Default response - include tools for ElevenLabs
-    logger.info("Returning default response with tools")
-    response_data = {
-        "jsonrpc": "2.0",
-        "id": request.get("id", 1),
-        "result": {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {
-                "tools": {}
-            },
-            "serverInfo": {
-                "name": "Google Calendar MCP Server",
-                "version": "1.0.0"
-            },
-            "tools": MCP_TOOLS
-        }
-    }
-    
-    return JSONResponse(
-        content=response_data,
-        headers={
-            "Content-Type": "application/json",
-            "X-MCP-Version": "2024-11-05",
-            "X-Server-Name": "Google Calendar MCP Server",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-            "Access-Control-Allow-Headers": "*"
-        }
-        )
+    return as_json_response(await handle_mcp_request(req))
 
 @app.options("/")
 @app.options("/mcp")
 @app.options("/mcp/tools")
 @app.options("/tools")
 async def options_handler():
-    """Handle CORS preflight requests"""
-    return JSONResponse(
-        content={},
-        headers={
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET, POST, OPTIONS, HEAD",
-            "Access-Control-Allow-Headers": "*",
-            "Access-Control-Max-Age": "86400"
-        }
-    )
+    """Handle plain OPTIONS requests (CORS preflights are answered by the middleware)"""
+    return ORJSONResponse(content={}, headers={"Allow": "GET, POST, OPTIONS"})
 
-@app.get("/health")
+@app.get("/health", response_class=PlainTextResponse)
 async def health():
     """Health check endpoint for Railway"""
-    return "ok"
+    return PlainTextResponse("ok")
 
 @app.get("/status")
 async def status():
     """Detailed status endpoint"""
-    service = get_calendar_service()
-    return {
+    # Report the client built at startup; probes must not trigger a rebuild.
+    # Returning the response directly skips FastAPI's jsonable_encoder pass.
+    return ORJSONResponse({
         "status": "running",
-        "calendar_service_available": service is not None,
-        "calendar_id": get_calendar_id(),
+        "calendar_service_available": getattr(app.state, "calendar_service", None) is not None,
+        "calendar_id": CONFIG.calendar_id,
         "tools_count": len(MCP_TOOLS),
         "timestamp": datetime.now().isoformat()
-    }
+    })
 
 @app.get("/mcp")
 async def mcp_info():
     """MCP server information endpoint"""
-    return {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "result": {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {
-                "tools": {}
-            },
-            "serverInfo": {
-                "name": "Google Calendar MCP Server",
-                "version": "1.0.0"
-            }
-        }
-    }
+    return Response(content=MCP_INFO_BYTES, media_type="application/json")
 
-@app.post("/mcp")
-async def mcp_post(request: dict):
+@app.post("/mcp", dependencies=[Depends(read_cache_control)])
+@rate_limit
+async def mcp_post(request: Request, req: MCPRequest):
     """MCP endpoint POST handler for MCP requests"""
-    logger.info(f"Received MCP POST request: {request}")
-    
-    # ElevenLabs might expect a direct tools list response
-    if not request or request == {}:
-        logger.info("Empty request - returning tools list")
-        return {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "result": {
-                "tools": MCP_TOOLS
-            }
-        }
-    
-    # Check if ElevenLabs is asking for capabilities
-    method = request.get("method", "")
-    logger.info(f"MCP method: {method}")
-    
-    if method == "tools/list" or method == "list_tools":
-        logger.info("Returning tools list")
-        return {
-            "jsonrpc": "2.0",
-            "id": request.get("id", 1),
-            "result": {
-                "tools": MCP_TOOLS
-            }
-        }
-    elif method == "initialize" or method == "init":
-        logger.info("Returning initialization response")
-        return {
-            "jsonrpc": "2.0",
-            "id": request.get("id", 1),
-            "result": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {
-                    "tools": {}
-                },
-                "serverInfo": {
-                    "name": "Google Calendar MCP Server",
-                    "version": "1.0.0"
-                }
-            }
-        }
-    else:
-        # Default: return both server info and tools
-        logger.info("Returning combined response")
-        response_data = {
-            "jsonrpc": "2.0",
-            "id": request.get("id", 1),
-            "result": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {
-                    "tools": {}
-                },
-                "serverInfo": {
-                    "name": "Google Calendar MCP Server",
-                    "version": "1.0.0"
-                },
-                "tools": MCP_TOOLS
-            }
-        }
-        
-        return JSONResponse(
-            content=response_data,
-            headers={
-                "Content-Type": "application/json",
-                "X-MCP-Version": "2024-11-05",
-                "X-Server-Name": "Google Calendar MCP Server",
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-                "Access-Control-Allow-Headers": "*"
-            }
-        )
+    return as_json_response(await handle_mcp_request(req))
 
-@app.get("/mcp/info")
-async def mcp_info_alt():
-    """Alternative MCP info endpoint for compatibility"""
-    return {
-        "jsonrpc": "2.0",
-        "result": {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {
-                "tools": {}
-            },
-            "serverInfo": {
-                "name": "Google Calendar MCP Server",
-                "version": "1.0.0"
-            }
-        }
-    }
+# Alternative MCP info path kept for compatibility
+app.add_api_route("/mcp/info", mcp_info, methods=["GET"])
 
 @app.get("/tools")
 async def list_tools():
     """List available tools - returns OpenAI function format for ElevenLabs"""
-    # Convert MCP tools to OpenAI function format
-    openai_tools = []
-    for tool in MCP_TOOLS:
-        openai_tool = {
-            "type": "function",
-            "function": {
-                "name": tool["name"],
-                "description": tool["description"],
-                "parameters": tool["inputSchema"]
-            }
-        }
-        openai_tools.append(openai_tool)
-    
-    return openai_tools
+    return Response(content=OPENAI_TOOLS_BYTES, media_type="application/json")
 
 @app.get("/mcp/tools")
 async def list_mcp_tools():
     """List available MCP tools in proper MCP format"""
-    return {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "result": {
-            "tools": MCP_TOOLS
-        }
-    }
+    return Response(content=TOOLS_LIST_BYTES, media_type="application/json")
 
-@app.post("/mcp/tools")
-async def call_mcp_tool(request: dict):
+@app.post("/mcp/tools", dependencies=[Depends(read_cache_control)])
+@rate_limit
+async def call_mcp_tool(request: Request, req: MCPRequest):
     """Execute MCP tool calls via /mcp/tools endpoint"""
-    return await call_tool(request)
+    return as_json_response(await handle_tool_request(req))
 
 @app.get("/elevenlabs/tools")
 async def list_elevenlabs_tools():
     """List tools in ElevenLabs format"""
-    return {
-        "tools": MCP_TOOLS
-    }
+    return Response(content=TOOLS_RESULT_BYTES, media_type="application/json")
 
 @app.get("/elevenlabs/webhook")
 async def elevenlabs_webhook_info():
     """ElevenLabs webhook endpoint info (for verification)"""
-    return {
-        "status": "ready",
-        "webhook_url": "/elevenlabs/webhook",
-        "method": "POST",
-        "description": "ElevenLabs webhook endpoint for agent tool calls"
-    }
+    return Response(content=WEBHOOK_INFO_BYTES, media_type="application/json")
 
-@app.post("/elevenlabs/webhook")
-async def elevenlabs_webhook(request: dict):
+@app.post("/elevenlabs/webhook", dependencies=[Depends(read_cache_control)])
+@rate_limit
+async def elevenlabs_webhook(request: Request, req: MCPRequest):
     """ElevenLabs webhook endpoint for agent tool calls"""
     try:
-        logger.info(f"Received ElevenLabs webhook: {request}")
+        logger.debug("Received ElevenLabs webhook: %s", req)
         
         # Extract tool call from ElevenLabs request
-        if "tool_calls" not in request:
+        if req.tool_calls is None:
             raise HTTPException(status_code=400, detail="No tool_calls in request")
         
-        tool_calls = request["tool_calls"]
-        results = []
-        
-        for tool_call in tool_calls:
-            tool_name = tool_call.get("function", {}).get("name")
-            tool_params = tool_call.get("function", {}).get("arguments", {})
-            
-            if not tool_name:
-                continue
-                
-            # Get calendar service
-            service = get_calendar_service()
-            if not service:
-                results.append({
-                    "tool_call_id": tool_call.get("id"),
-                    "error": "Google Calendar service not available"
-                })
-                continue
-            
-            # Route to appropriate tool handler
-            try:
-                if tool_name == "check_availability":
-                    result = await check_availability(service, tool_params)
-                elif tool_name == "book_appointment":
-                    result = await book_appointment(service, tool_params)
-                elif tool_name == "cancel_appointment":
-                    result = await cancel_appointment(service, tool_params)
-                elif tool_name == "reschedule_appointment":
-                    result = await reschedule_appointment(service, tool_params)
-                elif tool_name == "get_appointments":
-                    result = await get_appointments(service, tool_params)
-                elif tool_name == "find_next_available":
-                    result = await find_next_available(service, tool_params)
-                else:
-                    result = f"Unknown tool: {tool_name}"
-                
-                results.append({
-                    "tool_call_id": tool_call.get("id"),
-                    "result": result
-                })
-                
-            except Exception as e:
-                logger.error(f"Tool execution failed: {e}")
-                results.append({
-                    "tool_call_id": tool_call.get("id"),
-                    "error": str(e)
-                })
+        # Callers that accept NDJSON get each result as soon as its tool finishes
+        if "application/x-ndjson" in request.headers.get("accept", ""):
+            return StreamingResponse(
+                stream_tool_calls(get_calendar_service(), req.tool_calls),
+                media_type="application/x-ndjson"
+            )
         
-        return {"results": results}
+        results = await dispatch_tool_calls(get_calendar_service(), req.tool_calls)
+        return ORJSONResponse({"results": results})
         
     except Exception as e:
-        logger.error(f"Webhook processing failed: {e}")
+        logger.error("Webhook processing failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/tools")
-async def call_tool(request: dict):
+@app.post("/tools", dependencies=[Depends(read_cache_control)])
+@rate_limit
+async def call_tool(request: Request, req: MCPRequest):
     """Execute tool calls - handles both MCP and ElevenLabs formats"""
+    return as_json_response(await handle_tool_request(req))
+
+async def handle_mcp_request(req: MCPRequest):
+    """Handle a JSON-RPC request posted to / or /mcp"""
+    logger.debug("Received MCP POST request: %s", req)
+    
+    # ElevenLabs might expect a direct tools list response
+    if req.is_empty():
+        logger.debug("Empty request - returning tools list")
+        return TOOLS_LIST_RESPONSE
+    
+    method = req.method
+    logger.debug("MCP method: %s", method)
+    
+    # Handle MCP initialization request
+    if method == "initialize" or method == "init":
+        logger.debug("Returning initialization response")
+        return {"jsonrpc": "2.0", "id": req.id, "result": INIT_RESULT}
+    
+    # Handle tool list requests
+    elif method == "tools/list" or method == "list_tools":
+        logger.debug("Returning tools list")
+        return {"jsonrpc": "2.0", "id": req.id, "result": TOOLS_RESULT}
+    
+    # Handle tool calls
+    elif method == "tools/call":
+        logger.debug("Handling tool call")
+        return await handle_tool_request(req)
+    
+    # Default: return both server info and tools for ElevenLabs
+    logger.debug("Returning combined response")
+    response_data = {"jsonrpc": "2.0", "id": req.id, "result": COMBINED_RESULT}
+    return ORJSONResponse(content=response_data, headers=MCP_RESPONSE_HEADERS)
+
+async def handle_tool_request(req: MCPRequest):
+    """Execute a tool request in MCP or ElevenLabs format"""
     try:
-        logger.info(f"Received tool call request: {request}")
+        logger.debug("Received tool call request: %s", req)
         
         service = get_calendar_service()
         if not service:
             raise HTTPException(status_code=500, detail="Google Calendar service not available")
         
         # Handle MCP format
-        if "jsonrpc" in request and "method" in request:
-            method = request["method"]
-            params = request.get("params", {})
-            request_id = request.get("id", 1)
+        if {"jsonrpc", "method"} <= req.model_fields_set:
+            method = req.method
+            params = req.params if isinstance(req.params, dict) else {}
+            request_id = req.id
             
-            logger.info(f"MCP method in /tools: {method}")
+            logger.debug("MCP method in /tools: %s", method)
             
             # Handle MCP initialization in /tools endpoint
             if method == "initialize":
-                logger.info("Handling initialize in /tools endpoint - including tools in response")
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "protocolVersion": "2024-11-05",
-                        "capabilities": {
-                            "tools": {}
-                        },
-                        "serverInfo": {
-                            "name": "Google Calendar MCP Server",
-                            "version": "1.0.0"
-                        },
-                        "tools": MCP_TOOLS
-                    }
-                }
+                logger.debug("Handling initialize in /tools endpoint - including tools in response")
+                return {"jsonrpc": "2.0", "id": request_id, "result": COMBINED_RESULT}
             
             # Handle tools/list request
             elif method == "tools/list":
-                logger.info("Returning tools list for ElevenLabs")
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "tools": MCP_TOOLS
-                    }
-                }
+                logger.debug("Returning tools list for ElevenLabs")
+                return {"jsonrpc": "2.0", "id": request_id, "result": TOOLS_RESULT}
             
             # Handle notifications/initialized
             elif method == "notifications/initialized":
-                logger.info("Handling notifications/initialized in /tools")
+                logger.debug("Handling notifications/initialized in /tools")
                 return {
                     "jsonrpc": "2.0",
                     "id": request_id,
@@ -619,24 +803,19 @@ async def call_tool(request: dict):
                 }
             
             # Handle actual tool calls
-            elif method.startswith("tools/call") or method in ["check_availability", "book_appointment", "cancel_appointment", "reschedule_appointment", "get_appointments", "find_next_available"]:
-                tool_name = method.replace("tools/call/", "") if method.startswith("tools/call") else method
-                logger.info(f"Executing tool: {tool_name} with params: {params}")
-                
-                if tool_name == "check_availability":
-                    result = await check_availability(service, params)
-                elif tool_name == "book_appointment":
-                    result = await book_appointment(service, params)
-                elif tool_name == "cancel_appointment":
-                    result = await cancel_appointment(service, params)
-                elif tool_name == "reschedule_appointment":
-                    result = await reschedule_appointment(service, params)
-                elif tool_name == "get_appointments":
-                    result = await get_appointments(service, params)
-                elif tool_name == "find_next_available":
-                    result = await find_next_available(service, params)
+            elif method.startswith("tools/call") or method in TOOL_HANDLERS:
+                if method == "tools/call":
+                    # Standard MCP form: {"name": ..., "arguments": {...}}
+                    tool_name = params.get("name", "")
+                    params = params.get("arguments") or {}
                 else:
+                    tool_name = method.replace("tools/call/", "") if method.startswith("tools/call") else method
+                logger.debug("Executing tool: %s with params: %s", tool_name, params)
+                
+                handler = TOOL_HANDLERS.get(tool_name)
+                if handler is None:
                     raise HTTPException(status_code=400, detail=f"Unknown tool: {tool_name}")
+                result = await handler(service, parse_tool_arguments(tool_name, params))
                 
                 return {
                     "jsonrpc": "2.0",
@@ -645,166 +824,262 @@ async def call_tool(request: dict):
                 }
             
             else:
-                logger.warning(f"Unknown MCP method: {method}")
+                logger.warning("Unknown MCP method: %s", method)
                 # Try to trigger tools/list if this might be a tool discovery request
                 if method == "get_capabilities" or "tool" in method.lower():
-                    logger.info("Possible tool discovery request - returning tools list")
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "result": {
-                            "tools": MCP_TOOLS
-                        }
-                    }
+                    logger.debug("Possible tool discovery request - returning tools list")
+                    return {"jsonrpc": "2.0", "id": request_id, "result": TOOLS_RESULT}
                 raise HTTPException(status_code=400, detail=f"Unknown method: {method}")
         
         # Handle ElevenLabs format (tool_calls array)
-        elif "tool_calls" in request:
-            tool_calls = request["tool_calls"]
-            results = []
-            
-            for tool_call in tool_calls:
-                tool_name = tool_call.get("function", {}).get("name")
-                tool_params = tool_call.get("function", {}).get("arguments", {})
-                
-                if not tool_name:
-                    continue
-                
-                try:
-                    if tool_name == "check_availability":
-                        result = await check_availability(service, tool_params)
-                    elif tool_name == "book_appointment":
-                        result = await book_appointment(service, tool_params)
-                    elif tool_name == "cancel_appointment":
-                        result = await cancel_appointment(service, tool_params)
-                    elif tool_name == "reschedule_appointment":
-                        result = await reschedule_appointment(service, tool_params)
-                    elif tool_name == "get_appointments":
-                        result = await get_appointments(service, tool_params)
-                    elif tool_name == "find_next_available":
-                        result = await find_next_available(service, tool_params)
-                    else:
-                        result = f"Unknown tool: {tool_name}"
-                    
-                    results.append({
-                        "tool_call_id": tool_call.get("id"),
-                        "result": result
-                    })
-                    
-                except Exception as e:
-                    logger.error(f"Tool execution failed: {e}")
-                    import traceback
-                    error_details = f"{type(e).__name__}: {str(e)}\nTraceback: {traceback.format_exc()}"
-                    logger.error(f"Full error details: {error_details}")
-                    results.append({
-                        "tool_call_id": tool_call.get("id"),
-                        "error": error_details
-                    })
-            
+        elif req.tool_calls is not None:
+            results = await dispatch_tool_calls(service, req.tool_calls)
             return {"results": results}
         
         else:
             raise HTTPException(status_code=400, detail="Invalid request format")
         
     except Exception as e:
-        logger.error(f"Tool execution failed: {e}")
+        # str() of an HTTPException is empty; its message is in detail
+        message = e.detail if isinstance(e, HTTPException) else str(e)
+        logger.error("Tool execution failed: %s", message)
         return {
             "jsonrpc": "2.0", 
-            "id": request.get("id", 1),
-            "error": {"code": -32603, "message": str(e)}
+            "id": req.id,
+            "error": {"code": -32603, "message": message}
+        }
+
+async def run_tool_call(service, tool_call):
+    """Run one ElevenLabs-format tool call and return its result or error entry"""
+    tool_name = tool_call.get("function", {}).get("name")
+    tool_params = tool_call.get("function", {}).get("arguments", {})
+    
+    if not service:
+        return {
+            "tool_call_id": tool_call.get("id"),
+            "error": "Google Calendar service not available"
         }
+    
+    handler = TOOL_HANDLERS.get(tool_name)
+    try:
+        if handler is None:
+            result = f"Unknown tool: {tool_name}"
+        else:
+            result = await handler(service, parse_tool_arguments(tool_name, tool_params))
+        
+        return {
+            "tool_call_id": tool_call.get("id"),
+            "result": result
+        }
+        
+    except Exception as e:
+        error = e.detail if isinstance(e, HTTPException) else f"{type(e).__name__}: {e}"
+        logger.exception("Tool execution failed: %s", error)
+        return {
+            "tool_call_id": tool_call.get("id"),
+            "error": error
+        }
+
+async def dispatch_tool_calls(service, tool_calls):
+    """Run ElevenLabs-format tool_calls concurrently and collect a result or error per call.
+
+    Calls in one batch are independent, so their Calendar requests overlap;
+    results keep the order of tool_calls. Calls without a name are skipped.
+    """
+    # run_tool_call turns every failure into an error entry, so one bad call
+    # never cancels its siblings; the group just scopes the tasks to this request
+    async with asyncio.TaskGroup() as group:
+        tasks = [
+            group.create_task(run_tool_call(service, tool_call))
+            for tool_call in tool_calls
+            if tool_call.get("function", {}).get("name")
+        ]
+    return [task.result() for task in tasks]
+
+async def stream_tool_calls(service, tool_calls):
+    """Run tool_calls like dispatch_tool_calls, yielding one NDJSON line per call as it completes.
+
+    Lines come in completion order; tool_call_id ties each back to its call.
+    """
+    tasks = [
+        asyncio.create_task(run_tool_call(service, tool_call))
+        for tool_call in tool_calls
+        if tool_call.get("function", {}).get("name")
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield orjson.dumps(await next_done) + b"\n"
+    finally:
+        # Client went away mid-stream: don't leave tools running for nobody
+        for task in tasks:
+            task.cancel()
+
+# Slot helpers
+# Slot math runs on integer UTC epoch seconds: one parse per boundary up front,
+# then plain int compares instead of datetime arithmetic in the sweep.
+# check_availability offers a slot every 30 minutes
+SLOT_STEP = 30 * 60
+
+def parse_date_time(date, time):
+    """Parse 'YYYY-MM-DD' and 'HH:MM' into a naive datetime.
+
+    Slicing the fixed-width form is much cheaper than strptime; anything else
+    (e.g. '9:00', or fields with signs or spaces int() would accept) still goes
+    through strptime.
+    """
+    if (len(date) == 10 and len(time) == 5 and date[4] == date[7] == '-' and time[2] == ':'
+            and date[:4].isdigit() and date[5:7].isdigit() and date[8:].isdigit()
+            and time[:2].isdigit() and time[3:].isdigit()):
+        return datetime(int(date[:4]), int(date[5:7]), int(date[8:10]), int(time[:2]), int(time[3:5]))
+    return datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M")
+
+def epoch_seconds(moment):
+    """Integer epoch seconds for a datetime; naive values are taken as UTC like the slot grid"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+def from_epoch_seconds(seconds):
+    """Naive UTC datetime for integer epoch seconds, for formatting slots"""
+    return datetime.fromtimestamp(seconds, timezone.utc).replace(tzinfo=None)
+
+def parse_event_time(value):
+    """Parse an event start/end into integer UTC epoch seconds"""
+    # All-day events only carry a date
+    return epoch_seconds(ciso8601.parse_datetime(value.get('dateTime') or value['date']))
+
+def busy_intervals(events):
+    """Parse events once into (start, end) tuples sorted by start.
+
+    Events marked free ('transparent', the default for all-day events) don't
+    block a slot, matching what freeBusy reports to find_next_available.
+    """
+    return sorted(
+        (parse_event_time(event['start']), parse_event_time(event['end']))
+        for event in events
+        if event.get('transparency') != 'transparent'
+    )
+
+def freebusy_intervals(freebusy, calendar_id):
+    """Extract a calendar's busy periods from a freeBusy response as sorted (start, end) tuples"""
+    calendar = freebusy.get('calendars', {}).get(calendar_id, {})
+    if calendar.get('errors'):
+        reason = calendar['errors'][0].get('reason', 'unknown')
+        raise CalendarAPIError(400, f"freeBusy failed for calendar {calendar_id}: {reason}")
+    return sorted(
+        (parse_event_time({'dateTime': period['start']}), parse_event_time({'dateTime': period['end']}))
+        for period in calendar.get('busy', [])
+    )
+
+def free_slots(busy, slot_starts, slot_length):
+    """Yield the slot starts whose [start, start + slot_length) overlaps no busy interval.
+
+    All values are epoch seconds. slot_starts must be ascending and busy sorted
+    by start, so a single pointer sweeps both lists once: O(slots + events).
+    """
+    i = 0
+    for slot_start in slot_starts:
+        slot_end = slot_start + slot_length
+        # Intervals that ended before this slot can't overlap any later slot either
+        while i < len(busy) and busy[i][1] <= slot_start:
+            i += 1
+        if i >= len(busy) or busy[i][0] >= slot_end:
+            yield slot_start
+
+def first_free_slot(busy, windows, slot_length, step):
+    """Return the earliest free slot start across daily windows, or None.
+
+    windows are ascending (first_start, last_start) pairs; candidate starts are
+    first_start + k * step. Rather than testing every candidate, each busy
+    interval that blocks one jumps straight to the first candidate after it,
+    so the walk is O(windows + busy intervals).
+    """
+    i = 0
+    for first_start, last_start in windows:
+        candidate = first_start
+        while candidate <= last_start:
+            while i < len(busy) and busy[i][1] <= candidate:
+                i += 1
+            if i >= len(busy) or busy[i][0] >= candidate + slot_length:
+                return candidate
+            # Every start before this interval ends overlaps it
+            candidate += -(-(busy[i][1] - candidate) // step) * step
+    return None
 
 # Tool implementations
 async def check_availability(service, params):
     """Check available appointment slots during business hours (9 AM - 5 PM)"""
     try:
-        logger.info(f"check_availability called with params: {params}")
-        date = params['date']
-        duration = params.get('duration', 60)
+        logger.debug("check_availability called with params: %s", params)
+        date = params.date
+        duration = params.duration
         
         # Business hours: 9 AM to 5 PM
         start_time = "09:00"
         end_time = "17:00"
         
-        logger.info(f"Using business hours: date={date}, start_time={start_time}, end_time={end_time}, duration={duration}")
+        logger.debug("Using business hours: date=%s, start_time=%s, end_time=%s, duration=%s", date, start_time, end_time, duration)
         
         # Parse datetime
-        start_datetime = datetime.strptime(f"{date} {start_time}", "%Y-%m-%d %H:%M")
-        end_datetime = datetime.strptime(f"{date} {end_time}", "%Y-%m-%d %H:%M")
-        logger.info(f"Parsed datetimes: start={start_datetime}, end={end_datetime}")
+        start_datetime = parse_date_time(date, start_time)
+        end_datetime = parse_date_time(date, end_time)
+        logger.debug("Parsed datetimes: start=%s, end=%s", start_datetime, end_datetime)
         
         # Get existing events
-        calendar_id = get_calendar_id()
-        logger.info(f"Using calendar_id: {calendar_id}")
+        calendar_id = CONFIG.calendar_id
+        logger.debug("Using calendar_id: %s", calendar_id)
         
         # Format times for Google Calendar API (ISO format with timezone)
         time_min = start_datetime.isoformat() + 'Z'
         time_max = end_datetime.isoformat() + 'Z'
-        logger.info(f"API call: timeMin={time_min}, timeMax={time_max}")
+        logger.debug("API call: timeMin=%s, timeMax=%s", time_min, time_max)
         
-        events_result = service.events().list(
-            calendarId=calendar_id,
+        events_result = await service.list_events(
+            calendar_id,
             timeMin=time_min,
             timeMax=time_max,
             singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-        
-        logger.info(f"Google Calendar API call successful, got {len(events_result.get('items', []))} events")
+            orderBy='startTime',
+            maxResults=2500,
+            fields=BUSY_LIST_FIELDS
+        )
         
         events = events_result.get('items', [])
+        logger.debug("Google Calendar API call successful, got %d events", len(events))
         
-        # Find available slots
-        available_slots = []
-        current_time = start_datetime
+        # Candidate slots every 30 minutes that fit before closing time
+        slot_length = duration * 60
+        slot_starts = range(epoch_seconds(start_datetime), epoch_seconds(end_datetime) - slot_length + 1, SLOT_STEP)
         
-        while current_time + timedelta(minutes=duration) <= end_datetime:
-            slot_end = current_time + timedelta(minutes=duration)
-            
-            # Check if slot conflicts with existing event
-            is_available = True
-            for event in events:
-                event_start = datetime.fromisoformat(event['start']['dateTime'].replace('Z', '+00:00'))
-                event_end = datetime.fromisoformat(event['end']['dateTime'].replace('Z', '+00:00'))
-                
-                if (current_time < event_end and slot_end > event_start):
-                    is_available = False
-                    break
-            
-            if is_available:
-                available_slots.append({
-                    "time": current_time.strftime("%H:%M"),
-                    "datetime": current_time.isoformat()
-                })
-            
-            current_time += timedelta(minutes=30)  # Check every 30 minutes
+        # Parse events once and sweep them against the slots
+        slot_lines = [
+            f"- {from_epoch_seconds(slot_start):%H:%M}"
+            for slot_start in free_slots(busy_intervals(events), slot_starts, slot_length)
+        ]
         
-        if available_slots:
-            return f"Available {duration}-minute slots on {date} (business hours 9 AM - 5 PM): {len(available_slots)} slots found\n" + \
-                   "\n".join([f"- {slot['time']}" for slot in available_slots])
+        if slot_lines:
+            header = f"Available {duration}-minute slots on {date} (business hours 9 AM - 5 PM): {len(slot_lines)} slots found"
+            return "\n".join([header, *slot_lines])
         else:
             return f"No available {duration}-minute slots on {date} during business hours (9 AM - 5 PM)"
                
     except Exception as e:
-        logger.error(f"check_availability ERROR: {type(e).__name__}: {str(e)}")
-        logger.error(f"Full error details: {e}")
-        import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception("check_availability failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to check availability: {e}")
 
 async def book_appointment(service, params):
     """Book a new appointment"""
     try:
-        date = params['date']
-        time = params['time']
-        duration = params.get('duration', 60)
-        patient_name = params['patient_name']
-        patient_email = params['patient_email']
-        phone = params.get('phone', '')
-        service_type = params['service']
+        date = params.date
+        time = params.time
+        duration = params.duration
+        patient_name = params.patient_name
+        patient_email = params.patient_email
+        phone = params.phone or ''
+        service_type = params.service
         
         # Create datetime
-        start_datetime = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M")
+        start_datetime = parse_date_time(date, time)
         end_datetime = start_datetime + timedelta(minutes=duration)
         
         # Create event
@@ -824,15 +1099,17 @@ async def book_appointment(service, params):
             ]
         }
         
-        calendar_id = get_calendar_id()
-        event_result = service.events().insert(calendarId=calendar_id, body=event).execute()
+        calendar_id = CONFIG.calendar_id
+        event_result = await service.insert_event(calendar_id, event, fields="id")
         
-        return f"Appointment booked successfully!\n" + \
-               f"Date: {date} at {time}\n" + \
-               f"Patient: {patient_name}\n" + \
-               f"Service: {service_type}\n" + \
-               f"Duration: {duration} minutes\n" + \
-               f"Event ID: {event_result['id']}"
+        return "\n".join([
+            "Appointment booked successfully!",
+            f"Date: {date} at {time}",
+            f"Patient: {patient_name}",
+            f"Service: {service_type}",
+            f"Duration: {duration} minutes",
+            f"Event ID: {event_result['id']}"
+        ])
                
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to book appointment: {e}")
@@ -840,20 +1117,19 @@ async def book_appointment(service, params):
 async def cancel_appointment(service, params):
     """Cancel an appointment"""
     try:
-        appointment_id = params['appointment_id']
-        reason = params.get('reason', 'No reason provided')
+        appointment_id = params.appointment_id
+        reason = params.reason or 'No reason provided'
         
-        calendar_id = get_calendar_id()
+        calendar_id = CONFIG.calendar_id
         
-        # Get event details first
-        event = service.events().get(calendarId=calendar_id, eventId=appointment_id).execute()
+        # Delete the event directly; a 404/410 still surfaces as an error
+        await service.delete_event(calendar_id, appointment_id)
         
-        # Delete the event
-        service.events().delete(calendarId=calendar_id, eventId=appointment_id).execute()
-        
-        return f"Appointment cancelled successfully!\n" + \
-               f"Event: {event.get('summary', 'Unknown')}\n" + \
-               f"Reason: {reason}"
+        return "\n".join([
+            "Appointment cancelled successfully!",
+            f"Event ID: {appointment_id}",
+            f"Reason: {reason}"
+        ])
                
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to cancel appointment: {e}")
@@ -861,34 +1137,35 @@ async def cancel_appointment(service, params):
 async def reschedule_appointment(service, params):
     """Reschedule an appointment"""
     try:
-        appointment_id = params['appointment_id']
-        new_date = params['new_date']
-        new_time = params['new_time']
-        duration = params.get('duration', 60)
-        
-        calendar_id = get_calendar_id()
+        appointment_id = params.appointment_id
+        new_date = params.new_date
+        new_time = params.new_time
+        duration = params.duration
         
-        # Get existing event
-        event = service.events().get(calendarId=calendar_id, eventId=appointment_id).execute()
+        calendar_id = CONFIG.calendar_id
         
         # Update datetime
-        start_datetime = datetime.strptime(f"{new_date} {new_time}", "%Y-%m-%d %H:%M")
+        start_datetime = parse_date_time(new_date, new_time)
         end_datetime = start_datetime + timedelta(minutes=duration)
         
-        event['start']['dateTime'] = start_datetime.isoformat()
-        event['end']['dateTime'] = end_datetime.isoformat()
-        
-        # Update event
-        updated_event = service.events().update(
-            calendarId=calendar_id, 
-            eventId=appointment_id, 
-            body=event
-        ).execute()
+        # Patch only the times; no need to fetch the event first
+        event = await service.patch_event(calendar_id, appointment_id, {
+            'start': {
+                'dateTime': start_datetime.isoformat(),
+                'timeZone': 'UTC',
+            },
+            'end': {
+                'dateTime': end_datetime.isoformat(),
+                'timeZone': 'UTC',
+            }
+        }, fields="summary")
         
-        return f"Appointment rescheduled successfully!\n" + \
-               f"New date: {new_date} at {new_time}\n" + \
-               f"Duration: {duration} minutes\n" + \
-               f"Event: {event.get('summary', 'Unknown')}"
+        return "\n".join([
+            "Appointment rescheduled successfully!",
+            f"New date: {new_date} at {new_time}",
+            f"Duration: {duration} minutes",
+            f"Event: {event.get('summary', 'Unknown')}"
+        ])
                
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to reschedule appointment: {e}")
@@ -896,35 +1173,52 @@ async def reschedule_appointment(service, params):
 async def get_appointments(service, params):
     """Get appointments for date range"""
     try:
-        start_date = params['start_date']
-        end_date = params['end_date']
+        start_date = params.start_date
+        end_date = params.end_date
         
         # Parse dates
-        start_datetime = datetime.strptime(start_date, "%Y-%m-%d")
-        end_datetime = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)
-        
-        calendar_id = get_calendar_id()
-        events_result = service.events().list(
-            calendarId=calendar_id,
-            timeMin=start_datetime.isoformat() + 'Z',
-            timeMax=end_datetime.isoformat() + 'Z',
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
+        start_datetime = parse_date_time(start_date, "00:00")
+        end_datetime = parse_date_time(end_date, "00:00") + timedelta(days=1)
         
-        events = events_result.get('items', [])
+        limit = params.limit
+        page_token = params.page_token
+        
+        # Follow nextPageToken until the range is exhausted or the limit is hit,
+        # asking each page for no more than is still needed
+        calendar_id = CONFIG.calendar_id
+        events = []
+        while len(events) < limit:
+            page_params = {"pageToken": page_token} if page_token else {}
+            events_result = await service.list_events(
+                calendar_id,
+                cached=True,
+                timeMin=start_datetime.isoformat() + 'Z',
+                timeMax=end_datetime.isoformat() + 'Z',
+                singleEvents=True,
+                orderBy='startTime',
+                maxResults=limit - len(events),
+                fields=APPOINTMENT_LIST_FIELDS,
+                **page_params
+            )
+            events.extend(events_result.get('items', []))
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                break
         
         if not events:
             return f"No appointments found between {start_date} and {end_date}"
         
-        appointments = []
+        lines = [f"Appointments from {start_date} to {end_date}:"]
         for event in events:
-            start_time = datetime.fromisoformat(event['start']['dateTime'].replace('Z', '+00:00'))
-            appointments.append(
-                f"- {start_time.strftime('%Y-%m-%d %H:%M')}: {event.get('summary', 'No title')} (ID: {event['id']})"
-            )
+            # Shown in the event's own offset; all-day events only carry a date
+            start = event['start']
+            start_time = ciso8601.parse_datetime(start.get('dateTime') or start['date'])
+            lines.append(f"- {start_time:%Y-%m-%d %H:%M}: {event.get('summary', 'No title')} (ID: {event['id']})")
         
-        return f"Appointments from {start_date} to {end_date}:\n" + "\n".join(appointments)
+        if page_token:
+            lines.append(f"More appointments in this range; call again with page_token={page_token}")
+        
+        return "\n".join(lines)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get appointments: {e}")
@@ -932,8 +1226,8 @@ async def get_appointments(service, params):
 async def find_next_available(service, params):
     """Find next available appointment slot"""
     try:
-        duration = params.get('duration', 60)
-        days_ahead = params.get('days_ahead', 30)
+        duration = params.duration
+        days_ahead = params.days_ahead
         
         # Search from tomorrow
         search_start = datetime.now() + timedelta(days=1)
@@ -942,38 +1236,87 @@ async def find_next_available(service, params):
         # Business hours: 9 AM to 5 PM, Monday to Friday
         current_date = search_start.date()
         end_date = search_end.date()
+        slot_length = duration * 60
         
+        # One (first, last) hourly start window per weekday
+        windows = []
+        last_hour = 16 - (duration // 60)
         while current_date <= end_date:
             # Skip weekends
-            if current_date.weekday() < 5:  # Monday = 0, Friday = 4
-                # Check each hour from 9 AM to 4 PM (to allow for 1-hour appointments)
-                for hour in range(9, 17 - (duration // 60)):
-                    check_datetime = datetime.combine(current_date, datetime.min.time().replace(hour=hour))
-                    
-                    # Check if this slot is available
-                    calendar_id = get_calendar_id()
-                    events_result = service.events().list(
-                        calendarId=calendar_id,
-                        timeMin=check_datetime.isoformat() + 'Z',
-                        timeMax=(check_datetime + timedelta(minutes=duration)).isoformat() + 'Z',
-                        singleEvents=True
-                    ).execute()
-                    
-                    events = events_result.get('items', [])
-                    
-                    if not events:  # Slot is available
-                        return f"Next available {duration}-minute slot:\n" + \
-                               f"Date: {current_date.strftime('%Y-%m-%d')}\n" + \
-                               f"Time: {check_datetime.strftime('%H:%M')}\n" + \
-                               f"Day: {current_date.strftime('%A')}"
-            
+            if current_date.weekday() < 5 and last_hour >= 9:  # Monday = 0, Friday = 4
+                # Starts on the hour from 9 AM, ending by 5 PM for 1-hour appointments
+                midnight = epoch_seconds(datetime.combine(current_date, datetime.min.time()))
+                windows.append((midnight + 9 * 3600, midnight + last_hour * 3600))
             current_date += timedelta(days=1)
         
+        if windows:
+            # One freeBusy query covers the whole search window; it returns only
+            # merged busy periods, not full event bodies
+            calendar_id = CONFIG.calendar_id
+            freebusy = await service.query_freebusy({
+                "timeMin": from_epoch_seconds(windows[0][0]).isoformat() + 'Z',
+                "timeMax": from_epoch_seconds(windows[-1][1] + slot_length).isoformat() + 'Z',
+                "items": [{"id": calendar_id}]
+            })
+            
+            busy = freebusy_intervals(freebusy, calendar_id)
+            
+            slot_start = first_free_slot(busy, windows, slot_length, 3600)
+            if slot_start is not None:
+                check_datetime = from_epoch_seconds(slot_start)
+                return "\n".join([
+                    f"Next available {duration}-minute slot:",
+                    f"Date: {check_datetime:%Y-%m-%d}",
+                    f"Time: {check_datetime:%H:%M}",
+                    f"Day: {check_datetime:%A}"
+                ])
+        
         return f"No available {duration}-minute slots found in the next {days_ahead} days"
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to find next available slot: {e}")
 
+# Tool name -> implementation, shared by every endpoint that executes tools.
+# Handlers receive the tool's PARAM_MODELS instance, already validated.
+TOOL_HANDLERS: Dict[str, Callable[[Any, BaseModel], Awaitable[str]]] = {
+    "check_availability": check_availability,
+    "book_appointment": book_appointment,
+    "cancel_appointment": cancel_appointment,
+    "reschedule_appointment": reschedule_appointment,
+    "get_appointments": get_appointments,
+    "find_next_available": find_next_available,
+}
+
+# Catch a tool advertised in MCP_TOOLS without an implementation (or the
+# reverse) at import time rather than on the first call
+if TOOL_HANDLERS.keys() != {tool["name"] for tool in MCP_TOOLS}:
+    raise RuntimeError("TOOL_HANDLERS and MCP_TOOLS list different tools")
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # One process per core (capped, since containers often report the host's
+    # cores). Each worker builds its own Calendar client and refreshes its own
+    # token; set RATE_LIMIT_STORAGE_URI to share rate limits between them.
+    workers = int(os.environ.get("WEB_CONCURRENCY", min(os.cpu_count() or 1, 4)))
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        workers=workers,
+        # Bound in-flight requests per worker; beyond this uvicorn answers 503
+        limit_concurrency=int(os.environ.get("LIMIT_CONCURRENCY", 100)),
+        # Railway's proxy is the only way in; trust its X-Forwarded-For so the
+        # rate limiter keys on the real client address
+        forwarded_allow_ips="*",
+        # uvloop + httptools come with uvicorn[standard]; pin them so a broken
+        # install fails loudly instead of silently falling back to asyncio/h11
+        loop="uvloop",
+        http="httptools",
+        # Keep idle connections open well past uvicorn's 5s default so bursts
+        # of ElevenLabs tool calls reuse the same connection
+        timeout_keep_alive=75,
+        log_level="info",
+        # A synchronous log write per request adds up; Railway's edge already
+        # logs requests. Set ACCESS_LOG=1 to turn uvicorn's access log back on.
+        access_log=os.environ.get("ACCESS_LOG") == "1"
+    )